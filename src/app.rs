@@ -0,0 +1,194 @@
+//! End-to-end title generation pipeline shared by the CLI and library users
+
+use crate::{
+    context::ContextProcessor,
+    git::GitRepo,
+    ml::TitleGenerator,
+    GeneratorConfig, Result,
+};
+use log::debug;
+use std::path::Path;
+
+/// Generate a PR title for the repository at `working_dir`
+///
+/// `branch` defaults to the repository's current branch and is compared
+/// against `base`. The directory is passed explicitly so no process-wide
+/// state is touched, and the title is returned rather than printed so
+/// callers can embed the whole pipeline in-process. Nothing is written to
+/// stdout; diagnostics, including those from `TitleGenerator`, go through
+/// the `log` facade at debug level.
+pub async fn generate_pr_title(
+    config: &GeneratorConfig,
+    branch: Option<&str>,
+    base: &str,
+    working_dir: &Path,
+) -> Result<String> {
+    debug!("Working directory: {}", working_dir.display());
+    
+    // Open and validate git repository
+    let git_repo = GitRepo::open(working_dir)?;
+    debug!("Git repository found at: {}", git_repo.root_path().display());
+    
+    // Get branch name
+    let branch_name = match branch {
+        Some(branch) => branch.to_string(),
+        None => git_repo.current_branch()?,
+    };
+    debug!("Analyzing branch: {} (base: {})", branch_name, base);
+    
+    // Get commits between base and branch; resolving the branch here already
+    // reports BranchNotFound, so no separate existence check is needed
+    let commits = git_repo.get_commits_between(base, &branch_name, config.max_commits)?;
+    
+    debug!("Found {} commits to analyze", commits.len());
+    for (i, commit) in commits.iter().enumerate().take(5) {
+        debug!("  {}: {}", i + 1, commit.clean_message());
+    }
+    if commits.len() > 5 {
+        debug!("  ... and {} more", commits.len() - 5);
+    }
+    
+    // Initialize context processor
+    let context_processor = ContextProcessor::new()?;
+    
+    // Extract branch context
+    let branch_context = context_processor.extract_branch_context(&branch_name);
+    debug!("Branch context: {:#?}", branch_context);
+    
+    // Clean commit messages
+    let clean_commits = context_processor.clean_commit_messages(&commits);
+    debug!("Cleaned commit messages: {:#?}", clean_commits);
+    
+    // Create clean context for ML model
+    let clean_context = context_processor.create_clean_context(&branch_context, &clean_commits);
+    debug!("Clean context for ML model: {:#?}", clean_context);
+    
+    // Initialize ML title generator
+    let title_generator = TitleGenerator::new(config.clone())?;
+    
+    // Generate PR title
+    title_generator.generate_title(&clean_context).await
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::Error;
+    use tempfile::TempDir;
+    use std::process::Command;
+    
+    fn create_test_repo_with_commits() -> (TempDir, String) {
+        let temp_dir = TempDir::new().unwrap();
+        let repo_path = temp_dir.path();
+        
+        // Initialize git repo with a fixed base branch name, whatever the
+        // host's init.defaultBranch is
+        Command::new("git")
+            .args(["init", "-b", "master"])
+            .current_dir(repo_path)
+            .output()
+            .unwrap();
+        
+        // Configure git
+        Command::new("git")
+            .args(["config", "user.name", "Test User"])
+            .current_dir(repo_path)
+            .output()
+            .unwrap();
+        
+        Command::new("git")
+            .args(["config", "user.email", "test@example.com"])
+            .current_dir(repo_path)
+            .output()
+            .unwrap();
+        
+        // Create initial commit
+        std::fs::write(repo_path.join("README.md"), "# Test Repo").unwrap();
+        Command::new("git")
+            .args(["add", "."])
+            .current_dir(repo_path)
+            .output()
+            .unwrap();
+        
+        Command::new("git")
+            .args(["commit", "-m", "Initial commit"])
+            .current_dir(repo_path)
+            .output()
+            .unwrap();
+        
+        // Create a feature branch
+        Command::new("git")
+            .args(["checkout", "-b", "feature/CRU-310-fix-bottle-stuck"])
+            .current_dir(repo_path)
+            .output()
+            .unwrap();
+        
+        // Add some commits
+        std::fs::write(repo_path.join("fix.txt"), "Fix bottle stuck issue").unwrap();
+        Command::new("git")
+            .args(["add", "."])
+            .current_dir(repo_path)
+            .output()
+            .unwrap();
+        
+        Command::new("git")
+            .args(["commit", "-m", "fix: bottle stuck with remediation system"])
+            .current_dir(repo_path)
+            .output()
+            .unwrap();
+        
+        std::fs::write(repo_path.join("test.txt"), "Add tests").unwrap();
+        Command::new("git")
+            .args(["add", "."])
+            .current_dir(repo_path)
+            .output()
+            .unwrap();
+        
+        Command::new("git")
+            .args(["commit", "-m", "test: improve test coverage"])
+            .current_dir(repo_path)
+            .output()
+            .unwrap();
+        
+        let path_string = repo_path.to_string_lossy().to_string();
+        (temp_dir, path_string)
+    }
+    
+    #[tokio::test]
+    async fn test_integration_workflow() {
+        let (_temp_dir, repo_path) = create_test_repo_with_commits();
+        
+        // Test the main workflow against the fixture's master base
+        let result = generate_pr_title(
+            &GeneratorConfig::default(),
+            Some("feature/CRU-310-fix-bottle-stuck"),
+            "master",
+            Path::new(&repo_path),
+        )
+        .await;
+        
+        let title = result.expect("title generation should succeed");
+        assert!(title.starts_with("CRU-310"), "unexpected title: {}", title);
+    }
+    
+    #[tokio::test]
+    async fn test_non_git_directory() {
+        let temp_dir = TempDir::new().unwrap();
+        
+        let config = GeneratorConfig::default();
+        let result = generate_pr_title(&config, None, "main", temp_dir.path()).await;
+        
+        assert!(matches!(result, Err(Error::NotGitRepository { .. })));
+    }
+    
+    #[tokio::test]
+    async fn test_full_ref_names_and_head_resolve_as_branch() {
+        let (_temp_dir, repo_path) = create_test_repo_with_commits();
+        let config = GeneratorConfig::default();
+        
+        for branch in ["HEAD", "refs/heads/feature/CRU-310-fix-bottle-stuck"] {
+            let result = generate_pr_title(&config, Some(branch), "master", Path::new(&repo_path)).await;
+            assert!(result.is_ok(), "{} should resolve, got {:?}", branch, result);
+        }
+    }
+}
@@ -0,0 +1,51 @@
+//! Process-wide caching of compiled patterns
+
+use crate::Result;
+use regex::Regex;
+use std::sync::OnceLock;
+
+/// Build a value once per process and hand out clones afterwards
+///
+/// Meant for compiled regexes and regex sets, whose clones are cheap and
+/// share the compiled program. Errors are returned to the caller and
+/// nothing is cached, so a failed build is retried on the next call.
+pub(crate) fn cached<T: Clone>(
+    cell: &'static OnceLock<T>,
+    build: impl FnOnce() -> Result<T>,
+) -> Result<T> {
+    if let Some(value) = cell.get() {
+        return Ok(value.clone());
+    }
+    
+    let value = build()?;
+    Ok(cell.get_or_init(|| value).clone())
+}
+
+/// Compile `pattern` once per process and hand out cheap clones afterwards
+pub(crate) fn cached_regex(cell: &'static OnceLock<Regex>, pattern: &str) -> Result<Regex> {
+    cached(cell, || Ok(Regex::new(pattern)?))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    
+    #[test]
+    fn test_cached_builds_once() {
+        static CELL: OnceLock<String> = OnceLock::new();
+        
+        let first = cached(&CELL, || Ok("built".to_string())).unwrap();
+        let second = cached(&CELL, || panic!("value should already be cached")).unwrap();
+        
+        assert_eq!(first, "built");
+        assert_eq!(second, "built");
+    }
+    
+    #[test]
+    fn test_cached_regex_reports_invalid_pattern() {
+        static CELL: OnceLock<Regex> = OnceLock::new();
+        
+        assert!(matches!(cached_regex(&CELL, "("), Err(crate::Error::Regex(_))));
+        assert!(CELL.get().is_none());
+    }
+}
@@ -1,6 +1,6 @@
 //! Command line interface for the PR title generator
 
-use crate::{GeneratorConfig, Result};
+use crate::{git::GitRepo, GeneratorConfig, Result};
 use clap::{Parser, ValueEnum};
 
 /// Generate meaningful PR titles using ML models
@@ -112,36 +112,11 @@ impl Cli {
         }
     }
     
-    /// Get the branch name, using current branch if not specified
+    /// Get the branch name, using the current branch if not specified
     pub fn get_branch_name(&self) -> Result<String> {
-        if let Some(branch) = &self.branch {
-            Ok(branch.clone())
-        } else {
-            self.get_current_branch()
-        }
-    }
-    
-    /// Get the current git branch
-    fn get_current_branch(&self) -> Result<String> {
-        use std::process::Command;
-        
-        let output = Command::new("git")
-            .args(["branch", "--show-current"])
-            .output()
-            .map_err(|e| crate::Error::Io(e))?;
-        
-        if !output.status.success() {
-            return Err(crate::Error::NoBranch);
-        }
-        
-        let branch = String::from_utf8_lossy(&output.stdout)
-            .trim()
-            .to_string();
-        
-        if branch.is_empty() {
-            Err(crate::Error::NoBranch)
-        } else {
-            Ok(branch)
+        match &self.branch {
+            Some(branch) => Ok(branch.clone()),
+            None => GitRepo::open(std::env::current_dir()?)?.current_branch(),
         }
     }
 }
@@ -191,6 +166,16 @@ mod tests {
         assert!(config.verbose);
     }
     
+    #[test]
+    fn test_explicit_branch_name() {
+        let cli = Cli {
+            branch: Some("feature/auth".to_string()),
+            ..Default::default()
+        };
+        
+        assert_eq!(cli.get_branch_name().unwrap(), "feature/auth");
+    }
+    
     #[test]
     fn test_temperature_validation() {
         let cli = Cli {
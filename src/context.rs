@@ -1,8 +1,39 @@
 //! Branch context extraction and text processing
 
-use crate::{git::CommitInfo, Result};
+use crate::{cache::cached_regex, git::CommitInfo, Result};
 use regex::Regex;
-use std::collections::HashSet;
+use std::sync::OnceLock;
+
+/// Words that carry no meaning on their own in a commit message
+const GENERIC_TERMS: &[&str] = &["update", "change", "modify", "fix", "improve", "add", "remove"];
+
+/// Ticket prefixes that mark a real issue reference rather than a random number
+const TICKET_PREFIXES: &[&str] = &["CRU-", "JIRA-", "TASK-", "BUG-", "FEATURE-", "FIX-"];
+
+/// Upper bound on commit text placed in the prompt; a title only needs the gist
+const MAX_PROMPT_COMMITS_CHARS: usize = 400;
+
+/// Fixed instruction block that opens every prompt, kept as a constant so
+/// only the per-branch context and changes are formatted at runtime
+const PROMPT_SYSTEM_PREFIX: &str = "<|system|>
+You are a helpful assistant that generates concise, meaningful PR titles based on commit messages and branch context.
+
+TITLE GENERATION RULES:
+- Generate a single, clear PR title that summarizes the main changes
+- Make it specific to the actual changes
+- Focus on what was accomplished, not how it was implemented
+- Do not include any explanations or additional text - only the title
+- Prioritize user-facing impact over technical implementation details
+- Keep it under 72 characters
+- Use present tense and active voice
+
+";
+
+/// Fixed closing block that hands the turn to the assistant
+const PROMPT_SUFFIX: &str = "
+
+Generate a concise PR title:<|user|>
+Based on the context and changes above, generate a concise PR title that captures the main accomplishment.<|assistant|>";
 
 /// Extracted context from a branch name and commits
 #[derive(Debug, Clone)]
@@ -40,31 +71,38 @@ impl ChangeType {
 pub struct ContextProcessor {
     // Precompiled regex patterns for efficiency
     ticket_regex: Regex,
-    noise_patterns: Vec<Regex>,
-    generic_terms: HashSet<String>,
+    noise_regex: Regex,
+    conventional_prefix_regex: Regex,
 }
 
 impl ContextProcessor {
     pub fn new() -> Result<Self> {
-        let ticket_regex = Regex::new(r"([A-Z]+-\d+)")?;
-        
-        let noise_patterns = vec![
-            Regex::new(r"\b\d{4,}\b")?,                    // Long numbers
-            Regex::new(r"\b[a-f0-9]{8,}\b")?,             // Hex strings
-            Regex::new(r"\b(cursor|origin|main|master|develop)\b")?, // Branch prefixes
-            Regex::new(r"\b(update|update-|update_)\b")?,   // Generic update prefixes
-            Regex::new(r"\s+")?,                           // Multiple spaces
-        ];
-        
-        let generic_terms = ["update", "change", "modify", "fix", "improve", "add", "remove"]
-            .iter()
-            .map(|s| s.to_string())
-            .collect();
+        static TICKET_REGEX: OnceLock<Regex> = OnceLock::new();
+        static NOISE_REGEX: OnceLock<Regex> = OnceLock::new();
+        static CONVENTIONAL_PREFIX_REGEX: OnceLock<Regex> = OnceLock::new();
+        
+        let ticket_regex = cached_regex(&TICKET_REGEX, r"([A-Z]+-\d+)")?;
+        
+        // One alternation so noise is stripped in a single pass over the text;
+        // whitespace is collapsed afterwards by `clean_text`
+        let noise_regex = cached_regex(&NOISE_REGEX, concat!(
+            r"\b(?:",
+            r"\d{4,}",                             // Long numbers
+            r"|[a-f0-9]{8,}",                      // Hex strings
+            r"|cursor|origin|main|master|develop", // Branch prefixes
+            r"|update|update-|update_",            // Generic update prefixes
+            r")\b",
+        ))?;
+        
+        let conventional_prefix_regex = cached_regex(
+            &CONVENTIONAL_PREFIX_REGEX,
+            r"(?i)^(?:fix|feat|feature|bug|hotfix|refactor|docs|style|test|chore|perf|ci):",
+        )?;
         
         Ok(Self {
             ticket_regex,
-            noise_patterns,
-            generic_terms,
+            noise_regex,
+            conventional_prefix_regex,
         })
     }
     
@@ -125,8 +163,7 @@ impl ContextProcessor {
     
     /// Check if a ticket number looks meaningful (not just random numbers)
     fn is_meaningful_ticket(&self, ticket: &str) -> bool {
-        let prefixes = ["CRU-", "JIRA-", "TASK-", "BUG-", "FEATURE-", "FIX-"];
-        prefixes.iter().any(|prefix| ticket.starts_with(prefix))
+        TICKET_PREFIXES.iter().any(|prefix| ticket.starts_with(prefix))
     }
     
     /// Infer the type of change from branch name
@@ -177,28 +214,19 @@ impl ContextProcessor {
     
     /// Clean a single commit message
     fn clean_single_commit_message(&self, message: &str) -> Option<String> {
-        let mut clean_message = message.to_string();
-        
         // Remove conventional commit prefixes
-        let conventional_prefixes = [
-            "fix:", "feat:", "feature:", "bug:", "hotfix:", "refactor:",
-            "docs:", "style:", "test:", "chore:", "perf:", "ci:",
-        ];
-        
-        for prefix in &conventional_prefixes {
-            if clean_message.to_lowercase().starts_with(prefix) {
-                clean_message = clean_message[prefix.len()..].trim().to_string();
-                break;
-            }
-        }
+        let clean_message = match self.conventional_prefix_regex.find(message) {
+            Some(prefix) => message[prefix.end()..].trim(),
+            None => message,
+        };
         
         // Remove merge and revert messages
-        if clean_message.to_lowercase().contains("merge") 
-            || clean_message.to_lowercase().contains("revert") {
+        let lower_message = clean_message.to_lowercase();
+        if lower_message.contains("merge") || lower_message.contains("revert") {
             return None;
         }
         
-        let cleaned = self.clean_text(&clean_message);
+        let cleaned = self.clean_text(clean_message);
         
         if cleaned.len() > 5 {
             Some(cleaned)
@@ -209,11 +237,7 @@ impl ContextProcessor {
     
     /// Clean text by removing noise patterns
     fn clean_text(&self, text: &str) -> String {
-        let mut clean_text = text.to_string();
-        
-        for pattern in &self.noise_patterns {
-            clean_text = pattern.replace_all(&clean_text, " ").to_string();
-        }
+        let clean_text = self.noise_regex.replace_all(text, " ");
         
         // Clean up whitespace and return
         clean_text.split_whitespace().collect::<Vec<_>>().join(" ")
@@ -239,7 +263,7 @@ impl ContextProcessor {
         
         // Only contains generic terms
         words.iter().all(|word| {
-            self.generic_terms.contains(&word.to_lowercase()) || word.len() <= 3
+            GENERIC_TERMS.contains(&word.to_lowercase().as_str()) || word.len() <= 3
         })
     }
 }
@@ -281,30 +305,23 @@ impl CleanContext {
         } else {
             self.commits.join("; ")
         };
+        let commits_str = truncate_chars(&commits_str, MAX_PROMPT_COMMITS_CHARS);
         
         format!(
-            "<|system|>
-You are a helpful assistant that generates concise, meaningful PR titles based on commit messages and branch context.
-
-TITLE GENERATION RULES:
-- Generate a single, clear PR title that summarizes the main changes
-- Make it specific to the actual changes
-- Focus on what was accomplished, not how it was implemented
-- Do not include any explanations or additional text - only the title
-- Prioritize user-facing impact over technical implementation details
-- Keep it under 72 characters
-- Use present tense and active voice
-
-Context: {}
-Changes: {}
-
-Generate a concise PR title:<|user|>
-Based on the context and changes above, generate a concise PR title that captures the main accomplishment.<|assistant|>",
-            context_str, commits_str
+            "{}Context: {}\nChanges: {}{}",
+            PROMPT_SYSTEM_PREFIX, context_str, commits_str, PROMPT_SUFFIX
         )
     }
 }
 
+/// Truncate text to at most `max_chars` characters without splitting a character
+fn truncate_chars(text: &str, max_chars: usize) -> &str {
+    match text.char_indices().nth(max_chars) {
+        Some((index, _)) => &text[..index],
+        None => text,
+    }
+}
+
 impl Default for ContextProcessor {
     fn default() -> Self {
         Self::new().expect("Failed to create ContextProcessor")
@@ -370,10 +387,40 @@ mod tests {
             Some("implement new authentication".to_string())
         );
         
+        assert_eq!(
+            processor.clean_single_commit_message("Refactor: split wallet sync worker"),
+            Some("split wallet sync worker".to_string())
+        );
+        
         // Should filter out merge messages
         assert_eq!(
             processor.clean_single_commit_message("Merge branch 'main' into feature"),
             None
         );
     }
+    
+    #[test]
+    fn test_clean_text_removes_noise() {
+        let processor = ContextProcessor::new().unwrap();
+        
+        assert_eq!(
+            processor.clean_text("update  origin auth 12345 deadbeef42 flow"),
+            "auth flow"
+        );
+    }
+    
+    #[test]
+    fn test_prompt_caps_commit_text() {
+        let context = CleanContext {
+            ticket: None,
+            change_type: None,
+            description: None,
+            commits: vec!["refactor wallet balance calculation".to_string(); 100],
+        };
+        
+        let prompt = context.to_prompt();
+        let changes = prompt.split("Changes: ").nth(1).unwrap();
+        let commits_str = changes.split("\n\n").next().unwrap();
+        assert_eq!(commits_str.chars().count(), MAX_PROMPT_COMMITS_CHARS);
+    }
 }
\ No newline at end of file
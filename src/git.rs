@@ -1,7 +1,7 @@
 //! Git repository operations and validation
 
 use crate::{Error, Result};
-use git2::{Repository, Commit, Oid};
+use git2::{Repository, Commit, ErrorCode, Oid};
 use std::path::{Path, PathBuf};
 
 /// Git repository wrapper with validation and operations
@@ -36,16 +36,22 @@ impl GitRepo {
     
     /// Get the current branch name
     pub fn current_branch(&self) -> Result<String> {
-        let head = self.repo.head()?;
+        let head = match self.repo.head() {
+            Ok(head) => head,
+            Err(e) if matches!(e.code(), ErrorCode::UnbornBranch | ErrorCode::NotFound) => {
+                return Err(Error::NoBranch);
+            }
+            Err(e) => return Err(e.into()),
+        };
         
-        if let Some(name) = head.shorthand() {
-            Ok(name.to_string())
-        } else {
-            Err(Error::NoBranch)
+        // A detached HEAD has no branch, matching `git branch --show-current`
+        match head.shorthand() {
+            Some(name) if head.is_branch() => Ok(name.to_string()),
+            _ => Err(Error::NoBranch),
         }
     }
     
-    /// Check if a branch exists
+    /// Check if a local or remote branch with this short name exists
     pub fn branch_exists(&self, branch_name: &str) -> bool {
         self.repo.find_branch(branch_name, git2::BranchType::Local).is_ok() ||
         self.repo.find_branch(branch_name, git2::BranchType::Remote).is_ok()
@@ -57,6 +63,12 @@ impl GitRepo {
         let branch_oid = self.resolve_reference(branch)?;
         let base_oid = self.resolve_reference(base)?;
         
+        // Running on the base branch itself is the common no-op case; skip
+        // the merge-base search and revwalk entirely
+        if branch_oid == base_oid {
+            return Err(no_commits_error(base, branch));
+        }
+        
         // Find merge base (common ancestor)
         let merge_base = self.repo.merge_base(base_oid, branch_oid)?;
         
@@ -68,13 +80,11 @@ impl GitRepo {
         
         let mut commits = Vec::new();
         
-        for (i, oid) in revwalk.enumerate() {
-            if i >= max_commits {
-                break;
-            }
-            
-            let oid = oid?;
-            let commit = self.repo.find_commit(oid)?;
+        // take() only replaces the manual counter: hide() and the sort flags
+        // make libgit2 walk the whole range on the first next(), so this caps
+        // the find_commit calls, not the walk itself
+        for oid in revwalk.take(max_commits) {
+            let commit = self.repo.find_commit(oid?)?;
             
             // Skip merge commits
             if commit.parent_count() > 1 {
@@ -85,10 +95,7 @@ impl GitRepo {
         }
         
         if commits.is_empty() {
-            return Err(Error::NoCommits {
-                base: base.to_string(),
-                branch: branch.to_string(),
-            });
+            return Err(no_commits_error(base, branch));
         }
         
         Ok(commits)
@@ -96,49 +103,31 @@ impl GitRepo {
     
     /// Resolve a reference (branch name) to an OID
     fn resolve_reference(&self, reference: &str) -> Result<Oid> {
-        // Try as a direct reference first
-        if let Ok(reference) = self.repo.find_reference(reference) {
-            return Ok(reference.target().unwrap_or_else(|| {
-                reference.symbolic_target_bytes()
-                    .and_then(|name| self.repo.find_reference(std::str::from_utf8(name).ok()?).ok())
-                    .and_then(|r| r.target())
-                    .unwrap()
-            }));
-        }
-        
-        // Try as a branch name
-        if let Ok(branch) = self.repo.find_branch(reference, git2::BranchType::Local) {
-            if let Some(oid) = branch.get().target() {
-                return Ok(oid);
-            }
-        }
-        
-        // Try as a remote branch
-        if let Ok(branch) = self.repo.find_branch(reference, git2::BranchType::Remote) {
-            if let Some(oid) = branch.get().target() {
-                return Ok(oid);
-            }
-        }
-        
-        // Try with refs/heads/ prefix
-        let full_ref = format!("refs/heads/{}", reference);
-        if let Ok(reference) = self.repo.find_reference(&full_ref) {
-            if let Some(oid) = reference.target() {
-                return Ok(oid);
-            }
-        }
-        
-        // Try with refs/remotes/origin/ prefix
-        let remote_ref = format!("refs/remotes/origin/{}", reference);
-        if let Ok(reference) = self.repo.find_reference(&remote_ref) {
-            if let Some(oid) = reference.target() {
-                return Ok(oid);
-            }
-        }
+        // Try the name as given, then as a local, remote and origin branch;
+        // resolve() follows symbolic references such as HEAD
+        let candidates = [
+            reference.to_string(),
+            format!("refs/heads/{}", reference),
+            format!("refs/remotes/{}", reference),
+            format!("refs/remotes/origin/{}", reference),
+        ];
         
-        Err(Error::BranchNotFound {
-            branch: reference.to_string(),
-        })
+        candidates
+            .iter()
+            .find_map(|name| {
+                let resolved = self.repo.find_reference(name).and_then(|r| r.resolve());
+                resolved.ok()?.target()
+            })
+            .ok_or_else(|| Error::BranchNotFound {
+                branch: reference.to_string(),
+            })
+    }
+}
+
+fn no_commits_error(base: &str, branch: &str) -> Error {
+    Error::NoCommits {
+        base: base.to_string(),
+        branch: branch.to_string(),
     }
 }
 
@@ -161,9 +150,10 @@ impl CommitInfo {
         }
     }
     
-    /// Get the commit message without the hash prefix
+    /// Get the commit subject line; the body is dropped because a title
+    /// only ever needs the one-line summary
     pub fn clean_message(&self) -> &str {
-        self.message.trim()
+        self.message.trim().lines().next().unwrap_or("")
     }
 }
 
@@ -235,4 +225,36 @@ mod tests {
         let result = GitRepo::open(temp_dir.path());
         assert!(matches!(result, Err(Error::NotGitRepository { .. })));
     }
+    
+    #[test]
+    fn test_no_commits_on_fresh_branch_at_base() {
+        let (temp_dir, repo) = create_test_repo();
+        let base = repo.current_branch().unwrap();
+        Command::new("git")
+            .args(["branch", "feature/empty"])
+            .current_dir(temp_dir.path())
+            .output()
+            .unwrap();
+        
+        let result = repo.get_commits_between(&base, "feature/empty", 20);
+        assert!(matches!(result, Err(Error::NoCommits { .. })));
+    }
+    
+    #[test]
+    fn test_unknown_branch_not_found() {
+        let (_temp_dir, repo) = create_test_repo();
+        let result = repo.get_commits_between("missing-base", "missing-branch", 20);
+        assert!(matches!(result, Err(Error::BranchNotFound { .. })));
+    }
+    
+    #[test]
+    fn test_clean_message_keeps_subject_only() {
+        let commit = CommitInfo {
+            hash: String::new(),
+            message: "\nfix: wallet sync\n\nLonger body\nSigned-off-by: Test User\n".to_string(),
+            author: "Test User".to_string(),
+            timestamp: 0,
+        };
+        assert_eq!(commit.clean_message(), "fix: wallet sync");
+    }
 }
\ No newline at end of file
@@ -3,6 +3,8 @@
 //! A machine learning-based library for generating meaningful PR titles
 //! from commit messages and branch context.
 
+pub mod app;
+mod cache;
 pub mod cli;
 pub mod git;
 pub mod context;
@@ -18,6 +20,8 @@ pub struct GeneratorConfig {
     pub temperature: f32,
     pub max_length: usize,
     pub max_commits: usize,
+    /// Set by `--verbose`; the library itself logs through `log` at debug
+    /// level, so the installed logger decides what is shown
     pub verbose: bool,
 }
 
@@ -54,6 +58,9 @@ impl GeneratorConfig {
         self
     }
     
+    /// Record the verbose flag; the library never reads it, so library
+    /// callers see diagnostics by enabling debug level for
+    /// `pr_title_generator` in their `log` backend instead
     pub fn with_verbose(mut self, verbose: bool) -> Self {
         self.verbose = verbose;
         self
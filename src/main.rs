@@ -3,250 +3,46 @@
 //! A machine learning-based tool for generating meaningful PR titles
 //! from commit messages and branch context.
 
-use pr_title_generator::{
-    cli::Cli,
-    context::ContextProcessor,
-    git::GitRepo,
-    ml::TitleGenerator,
-    Error, Result,
-};
+use pr_title_generator::{app, cli::Cli, Error};
 use std::env;
 use std::process;
 
-#[tokio::main]
+// A single-threaded runtime is enough for one title per invocation and
+// avoids spinning up a worker pool on every CLI start
+#[tokio::main(flavor = "current_thread")]
 async fn main() {
-    // Initialize logging
-    env_logger::init();
-    
     // Parse command line arguments
     let cli = Cli::parse_args();
     
+    // Initialize logging; --verbose surfaces the pipeline's debug diagnostics
+    let mut logger = env_logger::Builder::from_default_env();
+    if cli.verbose {
+        logger.filter_module("pr_title_generator", log::LevelFilter::Debug);
+    }
+    logger.init();
+    
     // Validate arguments
     if let Err(e) = cli.validate() {
         eprintln!("Error: {}", e);
         process::exit(1);
     }
     
-    // Run the application
-    if let Err(e) = run(cli).await {
-        eprintln!("Error: {}", e);
-        process::exit(1);
-    }
-}
-
-async fn run(cli: Cli) -> Result<()> {
     // Get current working directory
-    let current_dir = env::current_dir()
-        .map_err(|e| Error::Io(e))?;
-    
-    if cli.verbose {
-        println!("Working directory: {}", current_dir.display());
-    }
-    
-    // Open and validate git repository
-    let git_repo = GitRepo::open(&current_dir)?;
-    
-    if cli.verbose {
-        println!("Git repository found at: {}", git_repo.root_path().display());
-    }
-    
-    // Get branch name
-    let branch_name = cli.get_branch_name()?;
-    
-    if cli.verbose {
-        println!("Analyzing branch: {}", branch_name);
-        println!("Base branch: {}", cli.base);
-    }
-    
-    // Validate that the branch exists
-    if !git_repo.branch_exists(&branch_name) {
-        return Err(Error::BranchNotFound {
-            branch: branch_name,
-        });
-    }
-    
-    // Get commits between base and branch
-    let commits = git_repo.get_commits_between(&cli.base, &branch_name, cli.max_commits)?;
-    
-    if cli.verbose {
-        println!("Found {} commits to analyze", commits.len());
-        for (i, commit) in commits.iter().enumerate().take(5) {
-            println!("  {}: {}", i + 1, commit.clean_message());
-        }
-        if commits.len() > 5 {
-            println!("  ... and {} more", commits.len() - 5);
+    let current_dir = match env::current_dir() {
+        Ok(dir) => dir,
+        Err(e) => {
+            eprintln!("Error: {}", Error::Io(e));
+            process::exit(1);
         }
-    }
-    
-    // Initialize context processor
-    let context_processor = ContextProcessor::new()?;
-    
-    // Extract branch context
-    let branch_context = context_processor.extract_branch_context(&branch_name);
-    
-    if cli.verbose {
-        println!("Branch context: {:#?}", branch_context);
-    }
-    
-    // Clean commit messages
-    let clean_commits = context_processor.clean_commit_messages(&commits);
+    };
     
-    if cli.verbose {
-        println!("Cleaned commit messages:");
-        for (i, commit) in clean_commits.iter().enumerate() {
-            println!("  {}: {}", i + 1, commit);
-        }
-    }
-    
-    // Create clean context for ML model
-    let clean_context = context_processor.create_clean_context(&branch_context, &clean_commits);
-    
-    if cli.verbose {
-        println!("Clean context for ML model: {:#?}", clean_context);
-    }
-    
-    // Initialize ML title generator
+    // Run the application
     let config = cli.to_config();
-    let title_generator = TitleGenerator::new(config)?;
-    
-    // Generate PR title
-    let title = title_generator.generate_title(&clean_context).await?;
-    
-    // Output the generated title
-    println!("{}", title);
-    
-    Ok(())
-}
-
-#[cfg(test)]
-mod tests {
-    use super::*;
-    use tempfile::TempDir;
-    use std::process::Command;
-    
-    fn create_test_repo_with_commits() -> (TempDir, String) {
-        let temp_dir = TempDir::new().unwrap();
-        let repo_path = temp_dir.path();
-        
-        // Initialize git repo
-        Command::new("git")
-            .args(["init"])
-            .current_dir(repo_path)
-            .output()
-            .unwrap();
-        
-        // Configure git
-        Command::new("git")
-            .args(["config", "user.name", "Test User"])
-            .current_dir(repo_path)
-            .output()
-            .unwrap();
-        
-        Command::new("git")
-            .args(["config", "user.email", "test@example.com"])
-            .current_dir(repo_path)
-            .output()
-            .unwrap();
-        
-        // Create initial commit
-        std::fs::write(repo_path.join("README.md"), "# Test Repo").unwrap();
-        Command::new("git")
-            .args(["add", "."])
-            .current_dir(repo_path)
-            .output()
-            .unwrap();
-        
-        Command::new("git")
-            .args(["commit", "-m", "Initial commit"])
-            .current_dir(repo_path)
-            .output()
-            .unwrap();
-        
-        // Create a feature branch
-        Command::new("git")
-            .args(["checkout", "-b", "feature/CRU-310-fix-bottle-stuck"])
-            .current_dir(repo_path)
-            .output()
-            .unwrap();
-        
-        // Add some commits
-        std::fs::write(repo_path.join("fix.txt"), "Fix bottle stuck issue").unwrap();
-        Command::new("git")
-            .args(["add", "."])
-            .current_dir(repo_path)
-            .output()
-            .unwrap();
-        
-        Command::new("git")
-            .args(["commit", "-m", "fix: bottle stuck with remediation system"])
-            .current_dir(repo_path)
-            .output()
-            .unwrap();
-        
-        std::fs::write(repo_path.join("test.txt"), "Add tests").unwrap();
-        Command::new("git")
-            .args(["add", "."])
-            .current_dir(repo_path)
-            .output()
-            .unwrap();
-        
-        Command::new("git")
-            .args(["commit", "-m", "test: improve test coverage"])
-            .current_dir(repo_path)
-            .output()
-            .unwrap();
-        
-        let path_string = repo_path.to_string_lossy().to_string();
-        (temp_dir, path_string)
-    }
-    
-    #[tokio::test]
-    async fn test_integration_workflow() {
-        let (_temp_dir, repo_path) = create_test_repo_with_commits();
-        
-        // Change to the test repo directory
-        let original_dir = env::current_dir().unwrap();
-        env::set_current_dir(&repo_path).unwrap();
-        
-        // Test the main workflow - use master as default git branch name
-        let cli = Cli {
-            branch: Some("feature/CRU-310-fix-bottle-stuck".to_string()),
-            base: "master".to_string(),
-            verbose: false,
-            ..Default::default()
-        };
-        
-        let result = run(cli).await;
-        
-        // Restore original directory
-        env::set_current_dir(original_dir).unwrap();
-        
-        // The run should succeed (or at least not panic)
-        // Note: It's ok if there are no commits between branches in test repo
-        if let Err(e) = &result {
-            println!("Test run result: {:?}", e);
-            // Allow expected errors in test repos
-            let error_str = e.to_string();
-            assert!(
-                error_str.contains("No commits found") || 
-                error_str.contains("BranchNotFound") ||
-                error_str.contains("not found")
-            );
+    match app::generate_pr_title(&config, cli.branch.as_deref(), &cli.base, &current_dir).await {
+        Ok(title) => println!("{}", title),
+        Err(e) => {
+            eprintln!("Error: {}", e);
+            process::exit(1);
         }
     }
-    
-    #[tokio::test]
-    async fn test_non_git_directory() {
-        let temp_dir = TempDir::new().unwrap();
-        let original_dir = env::current_dir().unwrap();
-        
-        env::set_current_dir(temp_dir.path()).unwrap();
-        
-        let cli = Cli::default();
-        let result = run(cli).await;
-        
-        env::set_current_dir(original_dir).unwrap();
-        
-        assert!(matches!(result, Err(Error::NotGitRepository { .. })));
-    }
-}
\ No newline at end of file
+}
@@ -1,8 +1,22 @@
 //! Machine learning model integration for PR title generation
 
-use crate::{context::CleanContext, Error, GeneratorConfig, Result};
-use regex::Regex;
-use std::collections::HashMap;
+use crate::{
+    cache::{cached, cached_regex},
+    context::CleanContext,
+    Error, GeneratorConfig, Result,
+};
+use log::debug;
+use regex::{Regex, RegexSet};
+use std::sync::OnceLock;
+
+/// Model names accepted by the generator
+const SUPPORTED_MODELS: &[&str] = &["tiny-llama", "phi-2", "gemma-2b", "llama-2-7b"];
+
+/// Words that make a title too vague to prefix with a ticket
+const GENERIC_TITLE_TERMS: &[&str] = &["update", "change", "modify", "fix", "improve"];
+
+/// Conventional upper bound for a PR title, including any ticket prefix
+const MAX_TITLE_LENGTH: usize = 72;
 
 /// ML-based PR title generator
 pub struct TitleGenerator {
@@ -28,8 +42,7 @@ impl TitleGenerator {
         }
         
         // Validate model name
-        let supported_models = ["tiny-llama", "phi-2", "gemma-2b", "llama-2-7b"];
-        if !supported_models.contains(&config.model_name.as_str()) {
+        if !SUPPORTED_MODELS.contains(&config.model_name.as_str()) {
             return Err(Error::UnsupportedModel {
                 name: config.model_name.clone(),
             });
@@ -37,18 +50,14 @@ impl TitleGenerator {
         
         let patterns = PatternMatcher::new()?;
         
-        if config.verbose {
-            println!("Initialized title generator with model: {}", config.model_name);
-        }
+        debug!("Initialized title generator with model: {}", config.model_name);
         
         Ok(Self { config, patterns })
     }
     
     /// Generate a PR title from the given context
     pub async fn generate_title(&self, context: &CleanContext) -> Result<String> {
-        if self.config.verbose {
-            println!("Generating title with context: {:#?}", context);
-        }
+        debug!("Generating title with context: {:#?}", context);
         
         // For now, use pattern-based generation
         // TODO: Replace with actual ML model inference
@@ -56,9 +65,7 @@ impl TitleGenerator {
         
         let processed_title = self.post_process_title(title, context)?;
         
-        if self.config.verbose {
-            println!("Generated title: {}", processed_title);
-        }
+        debug!("Generated title: {}", processed_title);
         
         Ok(processed_title)
     }
@@ -67,7 +74,7 @@ impl TitleGenerator {
     fn post_process_title(&self, mut title: String, context: &CleanContext) -> Result<String> {
         // Ensure title is not too long
         if title.len() > self.config.max_length {
-            title = format!("{}...", &title[..self.config.max_length.saturating_sub(3)]);
+            title = truncate_with_ellipsis(&title, self.config.max_length);
         }
         
         // Add ticket number if not present and we have one
@@ -78,11 +85,11 @@ impl TitleGenerator {
         }
         
         // Ensure proper capitalization
-        title = self.capitalize_title(&title);
+        title = capitalize_first(&title);
         
         // Final length check after adding ticket
-        if title.len() > 72 {
-            title = format!("{}...", &title[..69]);
+        if title.len() > MAX_TITLE_LENGTH {
+            title = truncate_with_ellipsis(&title, MAX_TITLE_LENGTH);
         }
         
         Ok(title)
@@ -90,146 +97,117 @@ impl TitleGenerator {
     
     /// Check if a title is too generic
     fn is_generic_title(&self, title: &str) -> bool {
-        let generic_terms = ["update", "change", "modify", "fix", "improve"];
         let words: Vec<&str> = title.split_whitespace().collect();
         
         words.len() <= 2 || words.iter().all(|word| {
-            generic_terms.contains(&word.to_lowercase().as_str()) || word.len() <= 3
+            GENERIC_TITLE_TERMS.contains(&word.to_lowercase().as_str()) || word.len() <= 3
         })
     }
-    
-    /// Capitalize the first letter of each sentence
-    fn capitalize_title(&self, title: &str) -> String {
-        let mut chars: Vec<char> = title.chars().collect();
-        if let Some(first_char) = chars.first_mut() {
-            *first_char = first_char.to_uppercase().next().unwrap_or(*first_char);
-        }
-        chars.into_iter().collect()
-    }
 }
 
+/// Leading verbs for each action; titles are formatted as
+/// `{verb} {domain} {subject}`
+const ACTION_VERBS: &[(&str, &[&str])] = &[
+    ("fix", &["Fix", "Resolve", "Correct"]),
+    ("feature", &["Add", "Implement", "Introduce"]),
+    ("refactor", &["Refactor", "Improve", "Optimize"]),
+];
+
+/// Domain keywords and the aliases that identify them
+const DOMAIN_PATTERNS: &[(&str, &[&str])] = &[
+    ("auth", &["authentication", "authorization", "login", "security"]),
+    ("crypto", &["cryptocurrency", "blockchain", "wallet"]),
+    ("api", &["API", "endpoint", "service"]),
+];
+
 /// Pattern-based title generator (temporary replacement for ML model)
 struct PatternMatcher {
-    action_patterns: HashMap<String, Vec<String>>,
-    domain_patterns: HashMap<String, Vec<String>>,
-    cleanup_regex: Vec<Regex>,
+    cleanup_regex: Regex,
+    domain_set: RegexSet,
 }
 
 impl PatternMatcher {
     fn new() -> Result<Self> {
-        let mut action_patterns = HashMap::new();
-        let mut domain_patterns = HashMap::new();
-        
-        // Common action patterns
-        action_patterns.insert("fix".to_string(), vec![
-            "Fix {domain} {issue}".to_string(),
-            "Resolve {domain} {issue}".to_string(),
-            "Correct {domain} {issue}".to_string(),
-        ]);
-        
-        action_patterns.insert("feature".to_string(), vec![
-            "Add {domain} {feature}".to_string(),
-            "Implement {domain} {feature}".to_string(),
-            "Introduce {domain} {feature}".to_string(),
-        ]);
-        
-        action_patterns.insert("refactor".to_string(), vec![
-            "Refactor {domain} {component}".to_string(),
-            "Improve {domain} {component}".to_string(),
-            "Optimize {domain} {component}".to_string(),
-        ]);
-        
-        // Domain-specific patterns
-        domain_patterns.insert("auth".to_string(), vec![
-            "authentication".to_string(),
-            "authorization".to_string(),
-            "login".to_string(),
-            "security".to_string(),
-        ]);
-        
-        domain_patterns.insert("crypto".to_string(), vec![
-            "cryptocurrency".to_string(),
-            "blockchain".to_string(),
-            "wallet".to_string(),
-        ]);
-        
-        domain_patterns.insert("api".to_string(), vec![
-            "API".to_string(),
-            "endpoint".to_string(),
-            "service".to_string(),
-        ]);
-        
-        let cleanup_regex = vec![
-            Regex::new(r"\b(the|a|an)\b")?,
-            Regex::new(r"\s+")?,
-        ];
+        // Whitespace is collapsed by `clean_title`, so only articles need a regex
+        static CLEANUP_REGEX: OnceLock<Regex> = OnceLock::new();
+        let cleanup_regex = cached_regex(&CLEANUP_REGEX, r"\b(the|a|an)\b")?;
+        static DOMAIN_SET: OnceLock<RegexSet> = OnceLock::new();
+        let domain_set = cached(&DOMAIN_SET, Self::build_domain_set)?;
         
         Ok(Self {
-            action_patterns,
-            domain_patterns,
             cleanup_regex,
+            domain_set,
         })
     }
     
+    /// Compile every domain's aliases into one set so a single scan checks them all
+    fn build_domain_set() -> Result<RegexSet> {
+        let patterns = DOMAIN_PATTERNS.iter().map(|(_, aliases)| {
+            let escaped: Vec<String> = aliases.iter().map(|alias| regex::escape(alias)).collect();
+            format!("(?i){}", escaped.join("|"))
+        });
+        
+        Ok(RegexSet::new(patterns)?)
+    }
+    
     fn generate_title(&self, context: &CleanContext, config: &GeneratorConfig) -> Result<String> {
+        // Lowercase the commit text once and share it between the heuristics
+        let commit_text = context.commits.join(" ").to_lowercase();
+        
         // Extract key information
-        let action = self.determine_action(context);
-        let domain = self.extract_domain(context);
+        let action = self.determine_action(context, &commit_text);
+        let domain = self.extract_domain(context, &commit_text);
         let main_subject = self.extract_main_subject(context);
         
         // Generate title based on patterns
-        let title = if let Some(patterns) = self.action_patterns.get(&action) {
-            let pattern_index = (config.temperature * patterns.len() as f32) as usize;
-            let pattern = patterns.get(pattern_index).unwrap_or(&patterns[0]);
+        let title = if let Some(verbs) = self.action_verbs(action) {
+            let verb_index = (config.temperature * verbs.len() as f32) as usize;
+            let verb = verbs.get(verb_index).unwrap_or(&verbs[0]);
             
-            pattern
-                .replace("{domain}", &domain)
-                .replace("{issue}", &main_subject)
-                .replace("{feature}", &main_subject)
-                .replace("{component}", &main_subject)
+            format!("{} {} {}", verb, domain, main_subject)
         } else {
             // Fallback to simple pattern
             if domain.is_empty() {
                 main_subject
             } else {
-                format!("{} {}", self.capitalize_first(&action), main_subject)
+                format!("{} {}", capitalize_first(action), main_subject)
             }
         };
         
         Ok(self.clean_title(&title))
     }
     
-    fn determine_action(&self, context: &CleanContext) -> String {
+    fn action_verbs(&self, action: &str) -> Option<&'static [&'static str]> {
+        ACTION_VERBS
+            .iter()
+            .find(|(name, _)| *name == action)
+            .map(|(_, verbs)| *verbs)
+    }
+    
+    fn determine_action(&self, context: &CleanContext, commit_text: &str) -> &'static str {
         if let Some(change_type) = &context.change_type {
-            change_type.as_str().to_string()
+            change_type.as_str()
+        } else if commit_text.contains("fix") || commit_text.contains("bug") || commit_text.contains("issue") {
+            "fix"
+        } else if commit_text.contains("add") || commit_text.contains("implement") || commit_text.contains("feature") {
+            "feature"
+        } else if commit_text.contains("refactor") || commit_text.contains("improve") {
+            "refactor"
         } else {
-            // Infer from commits
-            let all_text = context.commits.join(" ").to_lowercase();
-            
-            if all_text.contains("fix") || all_text.contains("bug") || all_text.contains("issue") {
-                "fix".to_string()
-            } else if all_text.contains("add") || all_text.contains("implement") || all_text.contains("feature") {
-                "feature".to_string()
-            } else if all_text.contains("refactor") || all_text.contains("improve") {
-                "refactor".to_string()
-            } else {
-                "update".to_string()
-            }
+            "update"
         }
     }
     
-    fn extract_domain(&self, context: &CleanContext) -> String {
+    fn extract_domain(&self, context: &CleanContext, commit_text: &str) -> String {
         let all_text = format!(
             "{} {}",
-            context.description.as_deref().unwrap_or(""),
-            context.commits.join(" ")
-        ).to_lowercase();
+            context.description.as_deref().unwrap_or("").to_lowercase(),
+            commit_text
+        );
         
-        // Look for domain keywords
-        for (key, aliases) in &self.domain_patterns {
-            if aliases.iter().any(|alias| all_text.contains(&alias.to_lowercase())) {
-                return key.clone();
-            }
+        // Look for domain keywords; the lowest match index keeps table priority
+        if let Some(index) = self.domain_set.matches(&all_text).into_iter().next() {
+            return DOMAIN_PATTERNS[index].0.to_string();
         }
         
         // Extract first meaningful word
@@ -241,43 +219,44 @@ impl PatternMatcher {
     }
     
     fn extract_main_subject(&self, context: &CleanContext) -> String {
-        // Combine description and commits
-        let mut subjects = Vec::new();
-        
-        if let Some(desc) = &context.description {
-            subjects.push(desc.clone());
-        }
-        
-        subjects.extend(context.commits.iter().cloned());
-        
-        if subjects.is_empty() {
-            return "changes".to_string();
-        }
-        
-        // Find the most descriptive subject
-        subjects
-            .into_iter()
+        // Find the most descriptive subject without copying every candidate
+        context
+            .description
+            .iter()
+            .chain(context.commits.iter())
             .max_by_key(|s| s.len())
+            .cloned()
             .unwrap_or_else(|| "changes".to_string())
     }
     
     fn clean_title(&self, title: &str) -> String {
-        let mut clean = title.to_string();
-        
-        for regex in &self.cleanup_regex {
-            clean = regex.replace_all(&clean, " ").to_string();
-        }
+        let clean = self.cleanup_regex.replace_all(title, " ");
         
         clean.split_whitespace().collect::<Vec<_>>().join(" ")
     }
-    
-    fn capitalize_first(&self, s: &str) -> String {
-        let mut chars: Vec<char> = s.chars().collect();
-        if let Some(first) = chars.first_mut() {
-            *first = first.to_uppercase().next().unwrap_or(*first);
-        }
-        chars.into_iter().collect()
+}
+
+/// Shorten text to at most `max_len` bytes ending in "...", backing off to
+/// a character boundary so multi-byte characters are never split
+fn truncate_with_ellipsis(text: &str, max_len: usize) -> String {
+    let mut cut = max_len.saturating_sub(3).min(text.len());
+    while !text.is_char_boundary(cut) {
+        cut -= 1;
     }
+    format!("{}...", &text[..cut])
+}
+
+/// Uppercase the first character, copying the rest of the text in one pass
+fn capitalize_first(text: &str) -> String {
+    let mut chars = text.chars();
+    let Some(first) = chars.next() else {
+        return String::new();
+    };
+    
+    let mut capitalized = String::with_capacity(text.len());
+    capitalized.extend(first.to_uppercase());
+    capitalized.push_str(chars.as_str());
+    capitalized
 }
 
 // TODO: Future ML model integration using candle-rs
@@ -348,4 +327,59 @@ mod tests {
         assert!(!title.is_empty());
         assert!(title.len() <= 72);
     }
+    
+    #[test]
+    fn test_determine_action_from_commits() {
+        let matcher = PatternMatcher::new().unwrap();
+        let context = CleanContext {
+            ticket: None,
+            change_type: None,
+            description: None,
+            commits: vec!["implement wallet export".to_string()],
+        };
+        
+        let commit_text = context.commits.join(" ").to_lowercase();
+        assert_eq!(matcher.determine_action(&context, &commit_text), "feature");
+    }
+    
+    #[test]
+    fn test_extract_domain_prefers_table_order() {
+        let matcher = PatternMatcher::new().unwrap();
+        let context = CleanContext {
+            ticket: None,
+            change_type: None,
+            description: Some("wallet endpoint".to_string()),
+            commits: vec!["tighten login checks".to_string()],
+        };
+        
+        let commit_text = context.commits.join(" ").to_lowercase();
+        assert_eq!(matcher.extract_domain(&context, &commit_text), "auth");
+    }
+    
+    #[test]
+    fn test_capitalize_first() {
+        assert_eq!(capitalize_first("fix wallet sync"), "Fix wallet sync");
+        assert_eq!(capitalize_first("élan"), "Élan");
+        assert_eq!(capitalize_first(""), "");
+    }
+    
+    #[test]
+    fn test_pattern_title_uses_action_verb() {
+        let matcher = PatternMatcher::new().unwrap();
+        let context = CleanContext {
+            ticket: None,
+            change_type: Some(ChangeType::Fix),
+            description: Some("login timeout".to_string()),
+            commits: Vec::new(),
+        };
+        
+        let title = matcher.generate_title(&context, &GeneratorConfig::default()).unwrap();
+        assert_eq!(title, "Correct auth login timeout");
+    }
+    
+    #[test]
+    fn test_truncate_with_ellipsis_respects_char_boundaries() {
+        assert_eq!(truncate_with_ellipsis("fix wallet sync", 10), "fix wal...");
+        assert_eq!(truncate_with_ellipsis("añadir soporte", 5), "a...");
+    }
 }
\ No newline at end of file